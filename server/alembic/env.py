@@ -56,6 +56,12 @@ def do_run_migrations(connection):
 
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode."""
+    # Reuse a connection handed in by the caller (see run_migrations.py); the caller commits
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+        return
+
     # Use sync engine for Alembic migrations (Alembic works with sync engines)
     # Add SSL configuration for Supabase connections
     db_url = settings.DATABASE_URL
@@ -1 +1,6 @@
 # HTTP middleware package
+#
+# Write new middlewares as pure ASGI classes (``__init__(self, app)`` + ``async __call__(scope,
+# receive, send)``) and register them with ``app.add_middleware``. Do not use
+# ``@app.middleware("http")`` or ``BaseHTTPMiddleware``: ``call_next`` buffers streaming
+# responses (exports) into memory and breaks ``contextvars`` propagation.
@@ -0,0 +1,72 @@
+"""
+Request access logging as a pure ASGI middleware.
+
+Unlike ``@app.middleware("http")`` / ``BaseHTTPMiddleware``, this wraps ``send`` instead of
+``call_next``, so streaming responses (CSV/PDF exports) pass through unbuffered and
+``contextvars`` set by endpoints are not lost. Method, path and client come straight from the
+ASGI scope; no ``Request`` object is built.
+"""
+from __future__ import annotations
+
+import logging
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+access_logger = logging.getLogger("access")
+
+
+class AccessLogMiddleware:
+    """Log one access line per HTTP request; log unhandled exceptions before re-raising."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.time()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        client = scope.get("client")
+        client_host = client[0] if client else "unknown"
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            # Log unhandled exceptions to error log
+            process_time = time.time() - start_time
+            logger.error(
+                "Unhandled exception in %s %s",
+                scope["method"],
+                scope["path"],
+                exc_info=True,
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "client": client_host,
+                    "duration": f"{process_time:.3f}s",
+                },
+            )
+            # Re-raise to let FastAPI handle it
+            raise
+
+        process_time = time.time() - start_time
+        # Lazy %-formatting: the line is only built if a handler accepts the record
+        access_logger.info(
+            "%s %s - Status: %d - Duration: %.3fs - Client: %s",
+            scope["method"],
+            scope["path"],
+            status_code,
+            process_time,
+            client_host,
+        )
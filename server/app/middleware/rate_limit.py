@@ -15,7 +15,7 @@ from collections import defaultdict, deque
 from typing import Any, Deque, Dict, Tuple
 
 from fastapi import Request, Response, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.core.config import settings
 
@@ -85,19 +85,31 @@ def _redis_key_ip(client_ip: str) -> str:
     return safe
 
 
-def get_client_ip(request: Request) -> str:
-    """Client IP for rate limiting. Prefer proxy headers when present."""
-    forwarded = request.headers.get("x-forwarded-for")
+def _client_ip_from_scope(scope: Scope) -> str:
+    """Client IP for rate limiting, read from raw ASGI headers. Prefer proxy headers when present."""
+    forwarded = real = None
+    for name, value in scope.get("headers") or ():
+        if name == b"x-forwarded-for":
+            if forwarded is None:
+                forwarded = value
+        elif name == b"x-real-ip":
+            if real is None:
+                real = value
     if forwarded:
-        return forwarded.split(",")[0].strip() or "unknown"
-    real = request.headers.get("x-real-ip")
+        return forwarded.decode("latin-1").split(",")[0].strip() or "unknown"
     if real:
-        return real.strip()
-    if request.client and request.client.host:
-        return request.client.host
+        return real.decode("latin-1").strip()
+    client = scope.get("client")
+    if client and client[0]:
+        return client[0]
     return "unknown"
 
 
+def get_client_ip(request: Request) -> str:
+    """Client IP for rate limiting (same rules as the middleware)."""
+    return _client_ip_from_scope(request.scope)
+
+
 def _prune_old(q: Deque[float], now: float) -> None:
     cutoff = now - WINDOW_SECONDS
     while q and q[0] < cutoff:
@@ -286,21 +298,28 @@ async def check_rate_limit_async(client_ip: str, path: str) -> Tuple[bool, str]:
     return True, ""
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        if request.method == "OPTIONS":
-            return await call_next(request)
+class RateLimitMiddleware:
+    """Pure ASGI rate limiter; rejected requests get a 429 without reaching the app."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
 
-        path = request.url.path
-        client_ip = get_client_ip(request)
+        client_ip = _client_ip_from_scope(scope)
 
-        allowed, _ = await check_rate_limit_async(client_ip, path)
+        allowed, _ = await check_rate_limit_async(client_ip, scope["path"])
         if not allowed:
-            return Response(
+            response = Response(
                 content='{"detail":"Too many requests. Please try again later."}',
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 media_type="application/json",
                 headers={"Retry-After": str(int(WINDOW_SECONDS))},
             )
+            await response(scope, receive, send)
+            return
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
@@ -0,0 +1,60 @@
+"""
+Security response headers and production HTTPS redirect as a pure ASGI middleware.
+
+Header values live in ``app.core.security_headers``; this module only attaches them to the
+``http.response.start`` message so response bodies are streamed through untouched.
+"""
+from __future__ import annotations
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import RedirectResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.environment import is_production_environment
+from app.core.security_headers import PERMISSIONS_POLICY, content_security_policy_for_path
+
+
+class SecurityHeadersMiddleware:
+    """Add security headers to every HTTP response; redirect plain HTTP to HTTPS in production."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        is_production = is_production_environment()
+        request_headers = Headers(scope=scope)
+        forwarded_proto = request_headers.get("x-forwarded-proto", "").strip().lower()
+
+        # HTTPS redirect in production when request came over HTTP (proxy should do this; app fallback)
+        if is_production and forwarded_proto == "http":
+            host = request_headers.get("x-forwarded-host") or request_headers.get("host", "localhost")
+            path = scope["path"] or "/"
+            query = scope.get("query_string", b"")
+            if query:
+                path = f"{path}?{query.decode('latin-1')}"
+            response = RedirectResponse(url=f"https://{host}{path}", status_code=301)
+            await response(scope, receive, send)
+            return
+
+        path = scope["path"]
+        add_hsts = is_production and forwarded_proto == "https"
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-Content-Type-Options"] = "nosniff"
+                headers["X-Frame-Options"] = "DENY"
+                headers["X-XSS-Protection"] = "1; mode=block"
+                headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+                headers["Permissions-Policy"] = PERMISSIONS_POLICY
+                headers["Content-Security-Policy"] = content_security_policy_for_path(path)
+                # HSTS when request was forwarded over HTTPS
+                if add_hsts:
+                    headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains; preload"
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -56,8 +56,9 @@ def main():
     
     # Save to file
     try:
-        with open(token_file, 'w') as f:
-            json.dump(token_data, f, indent=2)
+        # Serialize first so the file is written in a single buffered write
+        with open(token_file, 'w', buffering=8192) as f:
+            f.write(json.dumps(token_data, indent=2, separators=(",", ": ")))
         
         print()
         print("=" * 60)
@@ -3,21 +3,19 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
-import time
 import logging
 
 from app.core.config import settings
 from app.core.environment import is_production_environment
-from app.core.security_headers import PERMISSIONS_POLICY, content_security_policy_for_path
-from app.core.database import engine, Base
 from app.api.v1.router import api_router
 from app.core.logging_config import setup_logging
+from app.middleware.access_log import AccessLogMiddleware
 from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.security_headers import SecurityHeadersMiddleware
 
 # Setup logging
 setup_logging()
 logger = logging.getLogger(__name__)
-access_logger = logging.getLogger("access")
 
 
 @asynccontextmanager
@@ -96,73 +94,12 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# Request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    
-    try:
-        # Process request
-        response = await call_next(request)
-        
-        # Calculate duration
-        process_time = time.time() - start_time
-        
-        # Log request
-        access_logger.info(
-            f"{request.method} {request.url.path} - "
-            f"Status: {response.status_code} - "
-            f"Duration: {process_time:.3f}s - "
-            f"Client: {request.client.host if request.client else 'unknown'}"
-        )
-        
-        return response
-    except Exception as e:
-        # Log unhandled exceptions to error log
-        process_time = time.time() - start_time
-        logger.error(
-            f"Unhandled exception in {request.method} {request.url.path}",
-            exc_info=True,
-            extra={
-                "method": request.method,
-                "path": str(request.url.path),
-                "client": request.client.host if request.client else 'unknown',
-                "duration": f"{process_time:.3f}s"
-            }
-        )
-        # Re-raise to let FastAPI handle it
-        raise
-
+# Middlewares are pure ASGI classes registered with add_middleware (see app/middleware/__init__.py).
+# Starlette wraps in reverse order of registration: CORS -> rate limit -> security headers -> access log.
+app.add_middleware(AccessLogMiddleware)
 
 # Security headers (add before CORS so they apply to all responses)
-@app.middleware("http")
-async def add_security_headers(request: Request, call_next):
-    from fastapi.responses import RedirectResponse
-
-    is_production = is_production_environment()
-    forwarded_proto = request.headers.get("x-forwarded-proto", "").strip().lower()
-
-    # HTTPS redirect in production when request came over HTTP (proxy should do this; app fallback)
-    if is_production and forwarded_proto == "http":
-        host = request.headers.get("x-forwarded-host") or request.headers.get("host", "localhost")
-        path = request.url.path or "/"
-        if request.url.query:
-            path = f"{path}?{request.url.query}"
-        return RedirectResponse(url=f"https://{host}{path}", status_code=301)
-
-    response = await call_next(request)
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    response.headers["Permissions-Policy"] = PERMISSIONS_POLICY
-    response.headers["Content-Security-Policy"] = content_security_policy_for_path(request.url.path)
-
-    # HSTS when request was forwarded over HTTPS
-    if is_production and forwarded_proto == "https":
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains; preload"
-
-    return response
+app.add_middleware(SecurityHeadersMiddleware)
 
 # Global rate limit by IP (must be *inside* CORS). If rate limit returns 429 without calling next,
 # an outer CORS layer would still add Access-Control-Allow-Origin; inner CORS would not run.
@@ -246,6 +183,7 @@ app.include_router(api_router, prefix="/api/v1")
 if __name__ == "__main__":
     import uvicorn
     import os
+    import sys
     from pathlib import Path
     
     # Enable reload in development mode (default to True if not in production)
@@ -253,18 +191,37 @@ if __name__ == "__main__":
     
     if reload:
         script_dir = Path(__file__).parent.absolute()
-        reload_dirs = [str(script_dir / "app"), str(script_dir)]
+        # Uvicorn also watches the working directory, so this does not narrow the walk; the
+        # excludes only stop changes under venv/, logs/ etc. from triggering a reload
+        reload_dirs = [str(script_dir / "app")]
+        reload_excludes = [
+            "*.pyc",
+            "*.log",
+            # Absolute paths so uvicorn treats them as excluded directories, not name patterns
+            *(str(script_dir / d) for d in ("__pycache__", ".git", "venv", ".venv", "logs")),
+        ]
         print("🔄 Auto-reload enabled - server will restart on file changes")
     else:
         reload_dirs = None
+        reload_excludes = None
+    
+    workers = None if reload else int(os.getenv("WEB_CONCURRENCY", "1"))
     
     uvicorn.run(
-        app,
+        # Reload and multiple workers require an import string; otherwise pass the app object so
+        # this module isn't imported (and the app built) a second time as "main"
+        "main:app" if reload or workers > 1 else app,
         host="0.0.0.0",
         port=8000,
+        # uvloop + httptools (uvicorn[standard]); uvloop has no Windows build
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        # One event loop per process; in-memory rate limits are per worker unless REDIS_URL is set
+        workers=workers,
         reload=reload,
         reload_dirs=reload_dirs,
         reload_includes=["*.py"] if reload else None,
+        reload_excludes=reload_excludes,
         reload_delay=0.25 if reload else None,
     )
 
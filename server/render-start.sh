@@ -10,4 +10,5 @@ if [ "${RUN_MIGRATIONS}" = "true" ]; then
 fi
 
 echo "Starting API..."
-exec uvicorn main:app --host 0.0.0.0 --port ${PORT:-8000}
+# uvloop + httptools; set WEB_CONCURRENCY for multiple worker processes (uvicorn reads it)
+exec uvicorn main:app --host 0.0.0.0 --port ${PORT:-8000} --loop uvloop --http httptools
@@ -12,11 +12,12 @@ if __name__ == "__main__":
     # Get the directory where this script is located
     script_dir = Path(__file__).parent.absolute()
     
-    # Watch both app directory and root for changes to main.py, etc.
-    reload_dirs = [
-        str(script_dir / "app"),
-        str(script_dir),  # Also watch root for main.py changes
-    ]
+    # Uvicorn always adds the working directory as a watch root, so started from this directory
+    # the whole server tree (including venv/, logs/, .git) is still walked and registered;
+    # reload_dirs only documents what we care about. reload_excludes filters change events,
+    # so edits under those directories don't trigger a reload. Keep the virtualenv outside
+    # the server directory to keep it out of the watch itself.
+    reload_dirs = [str(script_dir / "app")]
     
     print("🚀 Starting FastAPI development server with hot reload...")
     print("📁 Watching directories:")
@@ -31,10 +32,18 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=8000,
+        # uvloop + httptools (uvicorn[standard]); uvloop has no Windows build
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
         reload=True,  # Enable auto-reload
         reload_dirs=reload_dirs,  # Watch these directories for changes
         reload_includes=["*.py"],  # Watch these file patterns
-        reload_excludes=["*.pyc", "__pycache__", "*.log", ".git", "venv", ".venv"],  # Exclude these
+        reload_excludes=[
+            "*.pyc",
+            "*.log",
+            # Absolute paths so uvicorn treats them as excluded directories, not name patterns
+            *(str(script_dir / d) for d in ("__pycache__", ".git", "venv", ".venv", "logs")),
+        ],
         reload_delay=0.25,  # Small delay to avoid multiple reloads
         log_level="info",
     )
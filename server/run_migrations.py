@@ -13,6 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 import logging
 from alembic.config import Config
 from alembic import command
+from sqlalchemy import create_engine, pool, text
 from app.core.config import settings
 
 # Setup logging
@@ -22,23 +23,47 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _sync_database_url() -> str:
+    """settings.DATABASE_URL with the sync driver Alembic needs."""
+    db_url = settings.DATABASE_URL
+    if db_url.startswith("postgresql+asyncpg://"):
+        db_url = db_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+    return db_url
+
+
 def run_migrations():
     """Run Alembic migrations to head revision."""
+    engine = None
     try:
         logger.info("Starting database migrations...")
         logger.info(f"Database URL: {settings.DATABASE_URL[:20]}...")  # Log partial URL for security
         
-        # Create Alembic config
+        db_url = _sync_database_url()
+        
+        # Create Alembic config; settings.DATABASE_URL is the single source of truth
         alembic_cfg = Config(str(Path(__file__).parent / "alembic.ini"))
+        alembic_cfg.set_main_option("sqlalchemy.url", db_url)
+        
+        # Supabase requires SSL connections (psycopg2 sslmode, same as alembic/env.py)
+        connect_args = {}
+        if "supabase" in db_url.lower():
+            connect_args = {"sslmode": "require"}
+        engine = create_engine(db_url, poolclass=pool.NullPool, connect_args=connect_args)
         
-        # Run migrations
-        command.upgrade(alembic_cfg, "head")
+        # One connection for both the connectivity check and the migrations; committed on exit
+        with engine.begin() as connection:
+            connection.execute(text("SELECT 1"))
+            alembic_cfg.attributes["connection"] = connection
+            command.upgrade(alembic_cfg, "head")
         
         logger.info("✅ Migrations completed successfully!")
         return 0
     except Exception as e:
         logger.error(f"❌ Migration failed: {e}", exc_info=True)
         return 1
+    finally:
+        if engine is not None:
+            engine.dispose()
 
 if __name__ == "__main__":
     exit_code = run_migrations()
@@ -0,0 +1,60 @@
+"""
+Shared database engine and session factory for the maintenance scripts.
+
+Scripts open sessions with ``new_session()`` instead of building their own engine, so
+scripts chained in one process (e.g. ``add_employees`` then ``add_time_entries``) reuse the
+same connection pool. The engine is created on the first session, not at import. Use ``run()``
+as the ``__main__`` entry point; it disposes the pool once the script finishes.
+"""
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from scripts._runtime import use_uvloop
+
+_engine: Optional[AsyncEngine] = None
+_sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None
+
+
+def get_engine() -> AsyncEngine:
+    """Return the process-wide script engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        database_url = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
+        _engine = create_async_engine(
+            database_url,
+            echo=False,
+            pool_size=5,
+            max_overflow=0,
+            pool_pre_ping=False,
+        )
+    return _engine
+
+
+def new_session() -> AsyncSession:
+    """Open a session on the shared script engine (created on first call)."""
+    global _sessionmaker
+    if _sessionmaker is None:
+        _sessionmaker = async_sessionmaker(get_engine(), class_=AsyncSession, expire_on_commit=False)
+    return _sessionmaker()
+
+
+async def dispose_engine() -> None:
+    """Close pooled connections (the engine stays usable and reconnects on demand)."""
+    if _engine is not None:
+        await _engine.dispose()
+
+
+def run(main: Callable[[], Awaitable[None]]) -> None:
+    """Run a script coroutine on uvloop (if available) and dispose the shared engine afterwards."""
+
+    async def _main() -> None:
+        try:
+            await main()
+        finally:
+            await dispose_engine()
+
+    use_uvloop()
+    asyncio.run(_main())
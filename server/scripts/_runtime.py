@@ -0,0 +1,16 @@
+"""
+Event-loop setup shared by the maintenance scripts.
+
+Kept apart from ``scripts._db`` so scripts that manage their own engines (e.g.
+``migrate_to_supabase``) can use it without importing the shared script engine.
+"""
+import asyncio
+
+
+def use_uvloop() -> None:
+    """Use uvloop's event loop when installed (uvicorn[standard]; not available on Windows)."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
@@ -2,16 +2,14 @@
 Script to add 5 random employees to the database.
 Run with: python -m scripts.add_employees
 """
-import asyncio
 import sys
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy import select
-from app.core.config import settings
+from sqlalchemy import insert, select
+from scripts._db import new_session, run
 from app.core.security import get_password_hash, get_pin_hash
 from app.models.company import Company
 from app.models.user import User, UserRole, UserStatus, PayRateType
@@ -49,14 +47,15 @@ JOB_ROLES = [
 PAY_RATES = [18.00, 20.00, 22.50, 25.00, 27.50, 30.00, 32.50, 35.00, 40.00, 45.00]
 
 
+def email_for(name: str, company: Company) -> str:
+    """Build the demo login email for an employee name within a company."""
+    company_domain = company.name.lower().replace(' ', '').replace('company', '')
+    return f"{name.split()[0].lower()}@{company_domain}.com"
+
+
 async def add_employees():
     """Add 5 random employees to the first company in the database."""
-    # Create async engine
-    database_url = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
-    engine = create_async_engine(database_url, echo=False)
-    AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    
-    async with AsyncSessionLocal() as db:
+    async with new_session() as db:
         # Get the first company (or Demo Company if it exists)
         result = await db.execute(select(Company).order_by(Company.created_at))
         company = result.scalar_one_or_none()
@@ -71,29 +70,31 @@ async def add_employees():
         result = await db.execute(
             select(User.email).where(User.company_id == company.id)
         )
-        existing_emails = {email for email in result.scalars().all()}
+        existing_emails = set(result.scalars())
+        
+        # Select 5 random names that don't have existing emails (email computed once per name)
+        candidates = []
+        for name in EMPLOYEE_NAMES:
+            email = email_for(name, company)
+            if email not in existing_emails:
+                candidates.append((name, email))
         
-        # Select 5 random names that don't have existing emails
-        available_names = [name for name in EMPLOYEE_NAMES if f"{name.split()[0].lower()}@{company.name.lower().replace(' ', '')}.com" not in existing_emails]
+        if not candidates:
+            print("No unique names available. All sample employees already exist.")
+            return
+        
+        if len(candidates) < 5:
+            print(f"Warning: Only {len(candidates)} unique names available. Adding {len(candidates)} employees.")
         
-        if len(available_names) < 5:
-            print(f"Warning: Only {len(available_names)} unique names available. Adding {len(available_names)} employees.")
+        selected = random.sample(candidates, min(5, len(candidates)))
         
-        selected_names = random.sample(available_names, min(5, len(available_names)))
+        # All demo employees share the same password, so hash it once
+        shared_password_hash = get_password_hash("Employee123!")
         
+        employee_rows = []
         employees_added = []
         
-        for name in selected_names:
-            # Generate email from name
-            first_name = name.split()[0].lower()
-            company_domain = company.name.lower().replace(' ', '').replace('company', '')
-            email = f"{first_name}@{company_domain}.com"
-            
-            # Skip if email already exists
-            if email in existing_emails:
-                print(f"Skipping {name} - email {email} already exists")
-                continue
-            
+        for name, email in selected:
             # Random job role and pay rate
             job_role = random.choice(JOB_ROLES)
             pay_rate = random.choice(PAY_RATES)
@@ -102,23 +103,21 @@ async def add_employees():
             # Generate random 4-digit PIN
             pin = f"{random.randint(1000, 9999)}"
             
-            # Create employee
-            employee = User(
-                id=uuid.uuid4(),
-                company_id=company.id,
-                role=UserRole.FRONTDESK,
-                name=name,
-                email=email,
-                password_hash=get_password_hash("Employee123!"),
-                pin_hash=get_pin_hash(pin),
-                status=UserStatus.ACTIVE,
-                job_role=job_role,
-                pay_rate=pay_rate,  # Legacy field
-                pay_rate_cents=pay_rate_cents,
-                pay_rate_type=PayRateType.HOURLY,
-                overtime_multiplier=None,  # Use company default
-            )
-            db.add(employee)
+            employee_rows.append({
+                "id": uuid.uuid4(),
+                "company_id": company.id,
+                "role": UserRole.FRONTDESK,
+                "name": name,
+                "email": email,
+                "password_hash": shared_password_hash,
+                "pin_hash": get_pin_hash(pin),
+                "status": UserStatus.ACTIVE,
+                "job_role": job_role,
+                "pay_rate": pay_rate,  # Legacy field
+                "pay_rate_cents": pay_rate_cents,
+                "pay_rate_type": PayRateType.HOURLY,
+                "overtime_multiplier": None,  # Use company default
+            })
             employees_added.append({
                 "name": name,
                 "email": email,
@@ -126,8 +125,9 @@ async def add_employees():
                 "job_role": job_role,
                 "pay_rate": pay_rate,
             })
-            existing_emails.add(email)
         
+        # Insert all employees in a single executemany round trip
+        await db.execute(insert(User), employee_rows)
         await db.commit()
         
         print(f"\n✓ Successfully added {len(employees_added)} employees!")
@@ -140,10 +140,8 @@ async def add_employees():
             print(f"  Job Role: {emp['job_role']}")
             print(f"  Pay Rate: ${emp['pay_rate']:.2f}/hour")
             print()
-    
-    await engine.dispose()
 
 
 if __name__ == "__main__":
-    asyncio.run(add_employees())
+    run(add_employees)
 
@@ -2,22 +2,20 @@
 Script to add time entries (punches) for all employees for a specified date range.
 Run with: python -m scripts.add_time_entries
 """
-import asyncio
 import sys
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy import select
-from app.core.config import settings
+from sqlalchemy import insert, select
+from scripts._db import new_session, run
 from app.models.company import Company
 from app.models.user import User, UserRole, UserStatus
 from app.models.time_entry import TimeEntry, TimeEntrySource, TimeEntryStatus
 import uuid
-from datetime import datetime, date, timedelta
-import pytz
+from datetime import datetime, date, timedelta, timezone
+from zoneinfo import ZoneInfo
 
 # Date range: December 15, 2025 to December 28, 2025
 START_DATE = date(2025, 12, 15)
@@ -28,15 +26,27 @@ WORK_START_HOUR = 9  # 9:00 AM
 WORK_DURATION_HOURS = 8
 BREAK_MINUTES = 30  # 30 minute lunch break
 
+# Row layout for bulk loading; created_at/updated_at use server defaults
+ENTRY_COLUMNS = [
+    "id", "company_id", "employee_id", "clock_in_at", "clock_out_at",
+    "break_minutes", "source", "status", "note",
+]
+# Below this many rows a single executemany INSERT is as fast as COPY
+COPY_THRESHOLD = 100
+
+
+def count_working_days(start: date, end: date) -> int:
+    """Count Monday-Friday days in the inclusive range [start, end] without iterating every day."""
+    total_days = (end - start).days + 1
+    full_weeks, extra_days = divmod(total_days, 7)
+    start_weekday = start.weekday()
+    # Each full week has 5 weekdays; the remaining days continue from start's weekday
+    return full_weeks * 5 + sum(1 for i in range(extra_days) if (start_weekday + i) % 7 < 5)
+
 
 async def add_time_entries():
     """Add time entries for all employees for the specified date range."""
-    # Create async engine
-    database_url = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
-    engine = create_async_engine(database_url, echo=False)
-    AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    
-    async with AsyncSessionLocal() as db:
+    async with new_session() as db:
         # Get the first company
         result = await db.execute(select(Company).order_by(Company.created_at))
         company = result.scalar_one_or_none()
@@ -48,7 +58,7 @@ async def add_time_entries():
         # Get company timezone from settings
         company_settings = company.settings_json or {}
         timezone_str = company_settings.get("timezone", "America/New_York")
-        tz = pytz.timezone(timezone_str)
+        tz = ZoneInfo(timezone_str)
         
         # Get all active employees
         result = await db.execute(
@@ -68,57 +78,64 @@ async def add_time_entries():
         print(f"Date range: {START_DATE} to {END_DATE}")
         print(f"Company timezone: {timezone_str}\n")
         
-        total_entries = 0
+        entries = []
         
         # Iterate through each day in the range
         current_date = START_DATE
         while current_date <= END_DATE:
             # Skip weekends (Saturday = 5, Sunday = 6)
             if current_date.weekday() < 5:  # Monday = 0, Friday = 4
-                # For each employee, create a time entry for this day
-                for employee in employees:
-                    # Create clock in time (9:00 AM in company timezone)
-                    clock_in_local = tz.localize(
-                        datetime.combine(current_date, datetime.min.time().replace(hour=WORK_START_HOUR))
-                    )
-                    clock_in_utc = clock_in_local.astimezone(pytz.UTC)
-                    
-                    # Create clock out time (5:00 PM in company timezone, accounting for 30 min break)
-                    clock_out_local = tz.localize(
-                        datetime.combine(
-                            current_date,
-                            datetime.min.time().replace(
-                                hour=WORK_START_HOUR + WORK_DURATION_HOURS,
-                                minute=BREAK_MINUTES
-                            )
-                        )
-                    )
-                    clock_out_utc = clock_out_local.astimezone(pytz.UTC)
-                    
-                    # Create time entry
-                    time_entry = TimeEntry(
-                        id=uuid.uuid4(),
-                        company_id=company.id,
-                        employee_id=employee.id,
-                        clock_in_at=clock_in_utc,
-                        clock_out_at=clock_out_utc,
-                        break_minutes=BREAK_MINUTES,
-                        source=TimeEntrySource.KIOSK,
-                        status=TimeEntryStatus.CLOSED,
-                        note=None,
+                # Create clock in time (9:00 AM in company timezone)
+                clock_in_local = datetime.combine(
+                    current_date, datetime.min.time().replace(hour=WORK_START_HOUR)
+                ).replace(tzinfo=tz)
+                clock_in_utc = clock_in_local.astimezone(timezone.utc)
+                
+                # Create clock out time (5:00 PM in company timezone, accounting for 30 min break)
+                clock_out_local = datetime.combine(
+                    current_date,
+                    datetime.min.time().replace(
+                        hour=WORK_START_HOUR + WORK_DURATION_HOURS,
+                        minute=BREAK_MINUTES
                     )
-                    db.add(time_entry)
-                    total_entries += 1
+                ).replace(tzinfo=tz)
+                clock_out_utc = clock_out_local.astimezone(timezone.utc)
+                
+                # For each employee, create a time entry row for this day (same times for everyone)
+                for employee in employees:
+                    entries.append((
+                        uuid.uuid4(),
+                        company.id,
+                        employee.id,
+                        clock_in_utc,
+                        clock_out_utc,
+                        BREAK_MINUTES,
+                        TimeEntrySource.KIOSK.value,
+                        TimeEntryStatus.CLOSED.value,
+                        None,
+                    ))
                 
                 print(f"Added entries for {current_date.strftime('%A, %B %d, %Y')} ({len(employees)} employees)")
             
             # Move to next day
             current_date += timedelta(days=1)
         
+        if len(entries) >= COPY_THRESHOLD:
+            # Stream rows over PostgreSQL COPY on the session's own connection/transaction
+            connection = await db.connection()
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                TimeEntry.__tablename__,
+                records=entries,
+                columns=ENTRY_COLUMNS,
+            )
+        elif entries:
+            await db.execute(insert(TimeEntry), [dict(zip(ENTRY_COLUMNS, row)) for row in entries])
         await db.commit()
+        total_entries = len(entries)
         
         # Calculate total hours
-        working_days = sum(1 for d in [START_DATE + timedelta(days=x) for x in range((END_DATE - START_DATE).days + 1)] if d.weekday() < 5)
+        working_days = count_working_days(START_DATE, END_DATE)
         total_hours_per_employee = working_days * WORK_DURATION_HOURS
         
         print(f"\n✓ Successfully added {total_entries} time entries!")
@@ -127,10 +144,8 @@ async def add_time_entries():
         print(f"  - {WORK_DURATION_HOURS} hours per day")
         print(f"  - {total_hours_per_employee} total hours per employee")
         print(f"  - {BREAK_MINUTES} minute break per day")
-    
-    await engine.dispose()
 
 
 if __name__ == "__main__":
-    asyncio.run(add_time_entries())
+    run(add_time_entries)
 
@@ -7,21 +7,32 @@ Run this after schema migrations are complete in Supabase.
 
 Usage:
     python scripts/migrate_to_supabase.py --source DATABASE_URL --target SUPABASE_URL
+
+Set SUPABASE_CA_CERT to the path of Supabase's CA certificate so TLS connections are verified.
 """
 import asyncio
+import json
 import sys
 import os
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import AsyncIterator, Callable, List, Dict, Any, Optional, Tuple
 import logging
-from datetime import datetime
+import enum
+import uuid
+from functools import lru_cache
+from datetime import date, datetime, time
+from decimal import Decimal
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy import func, select, text
+from sqlalchemy.pool import NullPool
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.sql import sqltypes
 from app.core.config import settings
+from scripts._runtime import use_uvloop
 from app.models import (
     Company, User, Session, TimeEntry, LeaveRequest,
     PayrollRun, PayrollLineItem, PayrollAdjustment,
@@ -35,6 +46,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round trip from the source and handed to the importer at a time
+EXPORT_CHUNK_SIZE = 1000
+# Chunks buffered between the source reader and the target writer of a table
+PIPELINE_DEPTH = 4
+# High-volume tables loaded with binary COPY when duplicates need not be skipped
+COPY_TABLES = {"time_entries", "payroll_line_items"}
+
 
 async def get_engine(db_url: str):
     """Create async engine from database URL."""
@@ -42,52 +60,179 @@ async def get_engine(db_url: str):
     if db_url.startswith("postgresql://"):
         db_url = db_url.replace("postgresql://", "postgresql+asyncpg://", 1)
     
-    # Configure SSL for Supabase
-    connect_args = {}
-    if "supabase.co" in db_url or "supabase" in db_url.lower() or "pooler.supabase.com" in db_url:
+    is_pooler = "pooler.supabase.com" in db_url
+    connect_args = {
+        # Session GUCs: no JIT warmup on the bulk SELECTs, keepalives so idle pooled
+        # connections survive between tables
+        "server_settings": {"jit": "off", "tcp_keepalives_idle": "60"},
+        # pgbouncer (transaction mode) cannot keep prepared statements; direct connections
+        # reuse the prepared INSERTs across chunks (full chunks all render the same statements)
+        "statement_cache_size": 0 if is_pooler else 1024,
+        "prepared_statement_cache_size": 0 if is_pooler else 256,
+    }
+    if is_pooler:
+        # Unique names so a statement prepared on one pgbouncer backend never collides on another
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+    
+    # Configure SSL for Supabase with certificate and hostname verification.
+    # SUPABASE_CA_CERT points at Supabase's CA bundle (Dashboard > Database > SSL);
+    # without it the system trust store is used.
+    if "supabase" in db_url.lower():
         import ssl
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        connect_args = {"ssl": ssl_context}
+        ssl_context = ssl.create_default_context(cafile=os.getenv("SUPABASE_CA_CERT") or None)
+        connect_args["ssl"] = ssl_context
+    
+    # Supabase's pgbouncer pooler already pools server connections; don't pool twice
+    if is_pooler:
+        return create_async_engine(
+            db_url,
+            connect_args=connect_args,
+            echo=False,
+            poolclass=NullPool,
+            insertmanyvalues_page_size=EXPORT_CHUNK_SIZE,
+        )
     
-    return create_async_engine(db_url, connect_args=connect_args, echo=False)
+    # Batch load: a few concurrent connections per database, created once per run
+    return create_async_engine(
+        db_url,
+        connect_args=connect_args,
+        echo=False,
+        pool_size=10,
+        max_overflow=20,
+        pool_pre_ping=True,
+        # Batches of up to a chunk's rows; wide tables are split further to stay under asyncpg's
+        # 32767 bind-parameter limit, so a full chunk may be several INSERTs of differing length.
+        # Every full chunk of a table splits the same way, so those statements repeat and their
+        # prepared plans are reused; only the tail chunk renders new ones.
+        insertmanyvalues_page_size=EXPORT_CHUNK_SIZE,
+    )
 
 
 async def export_table_data(
     session: AsyncSession,
     model_class,
     table_name: str,
-    order_by_column: str = "created_at"
-) -> List[Dict[str, Any]]:
-    """Export all data from a table."""
+    order_by_column: Optional[str] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Stream a table's rows from the source in chunks of at most ``chunk_size`` dicts.
+
+    Selects the table's columns with Core (no ORM instances) and keeps driver values
+    (datetime, UUID, Decimal, dict) as-is so the importer can pass them straight through.
+    """
+    exported = 0
     try:
-        order_col = getattr(model_class, order_by_column, None) or model_class.id
-        result = await session.execute(
-            select(model_class).order_by(order_col)
-        )
-        rows = result.scalars().all()
+        table = model_class.__table__
+        stmt = select(*table.c)
+        # Unordered by default so Postgres can stream a sequential scan without sorting
+        if order_by_column is not None:
+            stmt = stmt.order_by(table.c[order_by_column])
+        result = await session.stream(stmt.execution_options(yield_per=chunk_size))
         
-        data = []
-        for row in rows:
-            # Convert SQLAlchemy model to dict
-            row_dict = {}
-            for column in model_class.__table__.columns:
-                value = getattr(row, column.name)
-                # Convert datetime to ISO format for JSON serialization
-                if hasattr(value, 'isoformat'):
-                    value = value.isoformat()
-                # Handle UUID
-                if hasattr(value, '__str__'):
-                    value = str(value)
-                row_dict[column.name] = value
-            data.append(row_dict)
+        async for partition in result.mappings().partitions(chunk_size):
+            data = [dict(row) for row in partition]
+            exported += len(data)
+            yield data
         
-        logger.info(f"Exported {len(data)} rows from {table_name}")
-        return data
+        logger.info(f"Exported {exported} rows from {table_name}")
     except Exception as e:
         logger.error(f"Error exporting {table_name}: {e}")
-        return []
+
+
+def _identity(value):
+    return value
+
+
+def _parse_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _make_converter(column_type) -> Callable[[str], Any]:
+    """Pick the string -> Python converter for a column type once, instead of sniffing each value."""
+    if isinstance(column_type, sqltypes.DateTime):
+        return _parse_datetime
+    if isinstance(column_type, sqltypes.Date):
+        return date.fromisoformat
+    if isinstance(column_type, sqltypes.Time):
+        return time.fromisoformat
+    if isinstance(column_type, sqltypes.Uuid):
+        return uuid.UUID
+    if isinstance(column_type, sqltypes.Boolean):
+        return lambda value: value == "True"
+    if isinstance(column_type, sqltypes.Float):
+        return float
+    if isinstance(column_type, sqltypes.Numeric):
+        return Decimal
+    if isinstance(column_type, sqltypes.Integer):
+        return int
+    return _identity
+
+
+@lru_cache(maxsize=None)
+def _column_converters(model_class) -> Dict[str, Callable[[str], Any]]:
+    """Converters keyed by column name, built once per table (the keys double as the column whitelist)."""
+    return {column.name: _make_converter(column.type) for column in model_class.__table__.columns}
+
+
+def _prepare_row(row_data: Dict[str, Any], converters: Dict[str, Callable[[str], Any]]) -> Dict[str, Any]:
+    """
+    Keep only the table's columns and convert any string values (e.g. hand-edited exports) to the
+    column's Python type; values that already came from the driver pass through untouched.
+    """
+    return {
+        key: converters[key](value) if isinstance(value, str) and value else value
+        for key, value in row_data.items()
+        if key in converters
+    }
+
+
+async def _insert_rows(session: AsyncSession, model_class, rows: List[Dict[str, Any]], skip_duplicates: bool) -> int:
+    """
+    Multi-row INSERT ... ON CONFLICT (id) DO NOTHING RETURNING id: existing rows are skipped by
+    the database and the returned IDs are exactly the rows inserted. Returns the inserted count.
+    """
+    table = model_class.__table__
+    stmt = pg_insert(table)
+    if skip_duplicates:
+        stmt = stmt.on_conflict_do_nothing(index_elements=["id"])
+    result = await session.execute(stmt.returning(table.c.id), rows)
+    return len(result.scalars().all())
+
+
+def _uses_copy(model_class, skip_duplicates: bool) -> bool:
+    """COPY has no ON CONFLICT, so it is only used when duplicates are not skipped."""
+    return not skip_duplicates and model_class.__table__.name in COPY_TABLES
+
+
+def _copy_value(value: Any, is_json: bool) -> Any:
+    # Enum columns come back from the source as Python enums; COPY wants the label
+    if isinstance(value, enum.Enum):
+        return value.value
+    # The connection's json/jsonb codecs (registered by SQLAlchemy) take serialized text
+    if is_json and value is not None and not isinstance(value, str):
+        return json.dumps(value)
+    return value
+
+
+async def _copy_rows(session: AsyncSession, model_class, rows: List[Dict[str, Any]]) -> int:
+    """Load rows with COPY FROM STDIN (binary) on the session's own connection and transaction."""
+    table = model_class.__table__
+    columns = [column for column in table.columns if column.name in rows[0]]
+    names = [column.name for column in columns]
+    json_flags = [isinstance(column.type, sqltypes.JSON) for column in columns]
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        table.name,
+        records=[
+            tuple(_copy_value(row.get(name), is_json) for name, is_json in zip(names, json_flags))
+            for row in rows
+        ],
+        columns=names,
+        schema_name=table.schema or "public",
+    )
+    return len(rows)
 
 
 async def import_table_data(
@@ -103,140 +248,173 @@ async def import_table_data(
         return 0
     
     imported = 0
-    skipped = 0
     errors = 0
+    converters = _column_converters(model_class)
     
     try:
+        # Whole chunk in one statement; no per-row exception handling on the happy path
+        rows = [_prepare_row(row_data, converters) for row_data in data]
+        if _uses_copy(model_class, skip_duplicates):
+            imported = await _copy_rows(session, model_class, rows)
+        else:
+            imported = await _insert_rows(session, model_class, rows, skip_duplicates)
+    except Exception as e:
+        # Rare: retry this chunk row by row so one bad row doesn't drop its neighbours
+        logger.warning(f"Batch insert into {table_name} failed, retrying row by row: {e}")
+        await session.rollback()
         for row_data in data:
             try:
-                # Check if row already exists (by ID)
-                if skip_duplicates and 'id' in row_data:
-                    pk = row_data['id']
-                    if isinstance(pk, str):
-                        try:
-                            import uuid
-                            pk = uuid.UUID(pk)
-                        except (ValueError, TypeError):
-                            pass
-                    existing = await session.get(model_class, pk)
-                    if existing:
-                        skipped += 1
-                        continue
-                
-                # Create model instance
-                # Handle datetime strings
-                for key, value in row_data.items():
-                    if isinstance(value, str):
-                        # Try to parse datetime
-                        try:
-                            if 'T' in value or (' ' in value and ':' in value):
-                                try:
-                                    from dateutil.parser import parse
-                                    row_data[key] = parse(value)
-                                except ImportError:
-                                    # Fallback to datetime if dateutil not available
-                                    from datetime import datetime
-                                    # Try ISO format first
-                                    try:
-                                        row_data[key] = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                                    except:
-                                        pass
-                        except:
-                            pass
-                
-                instance = model_class(**row_data)
-                session.add(instance)
-                imported += 1
-                
-            except Exception as e:
-                logger.error(f"Error importing row into {table_name}: {e}")
+                async with session.begin_nested():
+                    imported += await _insert_rows(
+                        session, model_class, [_prepare_row(row_data, converters)], skip_duplicates
+                    )
+            except Exception as row_error:
+                logger.error(f"Error importing row into {table_name}: {row_error}")
                 errors += 1
-                continue
-        
-        await session.commit()
-        logger.info(f"Imported {imported} rows into {table_name} (skipped: {skipped}, errors: {errors})")
-        return imported
     
+    skipped = len(data) - imported - errors
+    
+    try:
+        # One commit per chunk keeps target transactions bounded
+        await session.commit()
     except Exception as e:
         logger.error(f"Error importing {table_name}: {e}")
         await session.rollback()
         return 0
+    
+    logger.info(f"Imported {imported} rows into {table_name} (skipped: {skipped}, errors: {errors})")
+    return imported
 
 
-async def migrate_data(source_url: str, target_url: str, skip_existing: bool = True):
+async def migrate_table(
+    source_session: AsyncSession,
+    target_session: AsyncSession,
+    model_class,
+    table_name: str,
+    order_by_column: Optional[str] = None,
+    skip_duplicates: bool = True,
+) -> Tuple[int, int]:
+    """
+    Copy one table as a producer/consumer pipeline: source reads and target writes overlap,
+    and at most ``PIPELINE_DEPTH`` chunks are buffered in between. Returns (exported, imported).
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_DEPTH)
+    exported = 0
+    imported = 0
+
+    async def produce():
+        nonlocal exported
+        try:
+            async for data in export_table_data(source_session, model_class, table_name, order_by_column):
+                exported += len(data)
+                await queue.put(data)
+        except Exception:
+            await queue.put(None)
+            raise
+        # Sentinel: no more chunks for this table (not sent when cancelled; nobody is reading)
+        await queue.put(None)
+
+    async def consume():
+        nonlocal imported
+        while True:
+            data = await queue.get()
+            if data is None:
+                break
+            imported += await import_table_data(
+                target_session,
+                model_class,
+                table_name,
+                data,
+                skip_duplicates=skip_duplicates,
+            )
+
+    producer = asyncio.create_task(produce())
+    try:
+        await consume()
+    except BaseException:
+        # Consumer failed: cancel the producer so it doesn't stay blocked on a full queue,
+        # holding the source stream open while the sessions and engines are torn down
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+        raise
+    await producer
+    return exported, imported
+
+
+async def migrate_data(source_engine: AsyncEngine, target_engine: AsyncEngine, skip_existing: bool = True):
     """Main migration function."""
     logger.info("=" * 60)
     logger.info("Starting data migration to Supabase")
     logger.info("=" * 60)
     
-    # Create engines
-    logger.info("Connecting to source database...")
-    source_engine = await get_engine(source_url)
     source_session_maker = async_sessionmaker(source_engine, expire_on_commit=False)
-    
-    logger.info("Connecting to target database (Supabase)...")
-    target_engine = await get_engine(target_url)
     target_session_maker = async_sessionmaker(target_engine, expire_on_commit=False)
     
-    # Define migration order (respect foreign key constraints)
-    migration_order = [
-        (Company, "companies", "created_at"),
-        (User, "users", "created_at"),
-        (Session, "sessions", "id"),
-        (ShiftTemplate, "shift_templates", "id"),
-        (Shift, "shifts", "id"),
-        (TimeEntry, "time_entries", "clock_in_at"),
-        (CashDrawerSession, "cash_drawer_sessions", "created_at"),
-        (CashDrawerAudit, "cash_drawer_audit", "created_at"),
-        (LeaveRequest, "leave_requests", "created_at"),
-        (PayrollRun, "payroll_runs", "created_at"),
-        (PayrollLineItem, "payroll_line_items", "id"),
-        (PayrollAdjustment, "payroll_adjustments", "id"),
-        (ScheduleSwap, "schedule_swaps", "id"),
-        (AuditLog, "audit_logs", "created_at"),
+    # Migration levels (respect foreign key constraints): every table only references tables
+    # in earlier levels, so the tables within one level are migrated concurrently
+    migration_levels = [
+        [(Company, "companies")],
+        [(User, "users")],
+        [
+            (Session, "sessions"),
+            (ShiftTemplate, "shift_templates"),
+            (LeaveRequest, "leave_requests"),
+            (PayrollRun, "payroll_runs"),
+            (AuditLog, "audit_logs"),
+        ],
+        [
+            (Shift, "shifts"),
+            (PayrollLineItem, "payroll_line_items"),
+            (PayrollAdjustment, "payroll_adjustments"),
+        ],
+        [
+            (TimeEntry, "time_entries"),
+            (ScheduleSwap, "schedule_swaps"),
+        ],
+        [(CashDrawerSession, "cash_drawer_sessions")],
+        [(CashDrawerAudit, "cash_drawer_audit")],
     ]
     
-    async with source_session_maker() as source_session, target_session_maker() as target_session:
-        total_exported = 0
-        total_imported = 0
-        
-        for model_class, table_name, order_by_col in migration_order:
-            logger.info(f"\n--- Migrating {table_name} ---")
-            
-            # Export from source
-            data = await export_table_data(source_session, model_class, table_name, order_by_col)
-            total_exported += len(data)
-            
-            if not data:
-                logger.info(f"No data found in {table_name}, skipping...")
-                continue
-            
-            # Import to target
-            imported = await import_table_data(
+    async def migrate_one(model_class, table_name: str) -> Tuple[int, int]:
+        # Own sessions per table so sibling tables don't share (or wait on) a connection
+        async with source_session_maker() as source_session, target_session_maker() as target_session:
+            logger.info(f"--- Migrating {table_name} ---")
+            table_exported, table_imported = await migrate_table(
+                source_session,
                 target_session,
                 model_class,
                 table_name,
-                data,
-                skip_duplicates=skip_existing
+                skip_duplicates=skip_existing,
             )
-            total_imported += imported
-        
-        logger.info("\n" + "=" * 60)
-        logger.info("Migration Summary")
-        logger.info("=" * 60)
-        logger.info(f"Total rows exported: {total_exported}")
-        logger.info(f"Total rows imported: {total_imported}")
-        logger.info("=" * 60)
+            if not table_exported:
+                logger.info(f"No data found in {table_name}, skipping...")
+            return table_exported, table_imported
+    
+    # Per-table (exported, imported) counts, taken from the RETURNING rows of each INSERT
+    table_counts: Dict[str, Tuple[int, int]] = {}
+    
+    for level in migration_levels:
+        results = await asyncio.gather(*(migrate_one(*table) for table in level))
+        for (_, table_name), counts in zip(level, results):
+            table_counts[table_name] = counts
     
-    await source_engine.dispose()
-    await target_engine.dispose()
+    total_exported = sum(exported for exported, _ in table_counts.values())
+    total_imported = sum(imported for _, imported in table_counts.values())
+    
+    logger.info("\n" + "=" * 60)
+    logger.info("Migration Summary")
+    logger.info("=" * 60)
+    for table_name, (exported, imported) in table_counts.items():
+        logger.info(f"{table_name}: {exported} exported, {imported} imported")
+    logger.info(f"Total rows exported: {total_exported}")
+    logger.info(f"Total rows imported: {total_imported}")
+    logger.info("=" * 60)
 
 
-async def verify_migration(target_url: str):
+async def verify_migration(target_engine: AsyncEngine):
     """Verify migration by counting rows in both databases."""
     logger.info("\nVerifying migration...")
     
-    target_engine = await get_engine(target_url)
     target_session_maker = async_sessionmaker(target_engine, expire_on_commit=False)
     
     tables = [
@@ -253,13 +431,36 @@ async def verify_migration(target_url: str):
     async with target_session_maker() as session:
         for table_name, model_class in tables:
             try:
-                result = await session.execute(select(model_class))
-                count = len(result.scalars().all())
+                result = await session.execute(select(func.count()).select_from(model_class.__table__))
+                count = result.scalar_one()
                 logger.info(f"{table_name}: {count} rows")
             except Exception as e:
                 logger.error(f"Error counting {table_name}: {e}")
-    
-    await target_engine.dispose()
+
+
+async def run(
+    source_url: str,
+    target_url: str,
+    verify_only: bool = False,
+    skip_existing: bool = True,
+    deep_verify: bool = False,
+):
+    """Create each engine once, run the migration and/or verification, then dispose."""
+    logger.info("Connecting to target database (Supabase)...")
+    target_engine = await get_engine(target_url)
+    source_engine = None
+    try:
+        if not verify_only:
+            logger.info("Connecting to source database...")
+            source_engine = await get_engine(source_url)
+            await migrate_data(source_engine, target_engine, skip_existing)
+        # The migration summary already reports inserted rows; full-table counts are opt-in
+        if verify_only or deep_verify:
+            await verify_migration(target_engine)
+    finally:
+        if source_engine is not None:
+            await source_engine.dispose()
+        await target_engine.dispose()
 
 
 def main():
@@ -284,6 +485,11 @@ def main():
         action='store_true',
         help='Only verify migration, do not migrate'
     )
+    parser.add_argument(
+        '--deep-verify',
+        action='store_true',
+        help='After migrating, also count rows in the target tables'
+    )
     parser.add_argument(
         '--no-skip-existing',
         action='store_true',
@@ -304,12 +510,14 @@ def main():
         logger.error("Target database URL required. Use --target or TARGET_DATABASE_URL env var")
         sys.exit(1)
     
-    if args.verify_only:
-        asyncio.run(verify_migration(target_url))
-    else:
-        skip_existing = not args.no_skip_existing
-        asyncio.run(migrate_data(source_url, target_url, skip_existing))
-        asyncio.run(verify_migration(target_url))
+    use_uvloop()
+    asyncio.run(run(
+        source_url,
+        target_url,
+        verify_only=args.verify_only,
+        skip_existing=not args.no_skip_existing,
+        deep_verify=args.deep_verify,
+    ))
 
 
 if __name__ == "__main__":
@@ -2,33 +2,29 @@
 Seed script to create sample company, admin, and employees.
 Run with: python -m scripts.seed_data
 """
-import asyncio
 import sys
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from app.core.config import settings
+from scripts._db import new_session, run
 from app.core.security import get_password_hash, get_pin_hash
 from app.models.company import Company
 from app.models.user import User, UserRole, UserStatus, PayRateType
 import uuid
 from decimal import Decimal
 
+DEMO_COMPANY_NAME = "Demo Company"
+
 
 async def seed_data():
     """Seed the database with sample data."""
-    # Create async engine
-    database_url = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
-    engine = create_async_engine(database_url, echo=False)
-    AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    
-    async with AsyncSessionLocal() as db:
+    async with new_session() as db:
         # Check if company already exists
-        from sqlalchemy import select
-        result = await db.execute(select(Company).where(Company.name == "Demo Company"))
+        from sqlalchemy import insert, lambda_stmt, select
+        # lambda_stmt caches the compiled SQL, so repeated seeding in one process skips re-compiling
+        result = await db.execute(lambda_stmt(lambda: select(Company).where(Company.name == DEMO_COMPANY_NAME)))
         existing_company = result.scalar_one_or_none()
         
         if existing_company:
@@ -38,7 +34,7 @@ async def seed_data():
         # Create company
         company = Company(
             id=uuid.uuid4(),
-            name="Demo Company",
+            name=DEMO_COMPANY_NAME,
             settings_json={
                 "timezone": "America/New_York",
                 "payroll_week_start_day": 0,  # Monday (0=Mon, 6=Sun)
@@ -95,27 +91,37 @@ async def seed_data():
             },
         ]
         
+        # Employees share passwords; run the deliberately slow KDF once per distinct password
+        password_hashes: dict[str, str] = {}
+        
+        def hash_password(password: str) -> str:
+            if password not in password_hashes:
+                password_hashes[password] = get_password_hash(password)
+            return password_hashes[password]
+        
+        employee_rows = []
         for emp_data in employees_data:
             pay_rate = emp_data.get("pay_rate", 0)
             pay_rate_cents = int(Decimal(str(pay_rate)) * 100) if pay_rate else 0
             
-            employee = User(
-                id=uuid.uuid4(),
-                company_id=company.id,
-                role=emp_data.get("role", UserRole.FRONTDESK),
-                name=emp_data["name"],
-                email=emp_data["email"],
-                password_hash=get_password_hash(emp_data["password"]),
-                pin_hash=get_pin_hash(emp_data["pin"]),
-                status=UserStatus.ACTIVE,
-                job_role=emp_data.get("job_role"),
-                pay_rate=pay_rate,  # Legacy field
-                pay_rate_cents=pay_rate_cents,
-                pay_rate_type=PayRateType.HOURLY,
-                overtime_multiplier=None,  # Use company default
-            )
-            db.add(employee)
+            employee_rows.append({
+                "id": uuid.uuid4(),
+                "company_id": company.id,
+                "role": emp_data.get("role", UserRole.FRONTDESK),
+                "name": emp_data["name"],
+                "email": emp_data["email"],
+                "password_hash": hash_password(emp_data["password"]),
+                "pin_hash": get_pin_hash(emp_data["pin"]),
+                "status": UserStatus.ACTIVE,
+                "job_role": emp_data.get("job_role"),
+                "pay_rate": pay_rate,  # Legacy field
+                "pay_rate_cents": pay_rate_cents,
+                "pay_rate_type": PayRateType.HOURLY,
+                "overtime_multiplier": None,  # Use company default
+            })
         
+        # All employees in one executemany INSERT
+        await db.execute(insert(User), employee_rows)
         await db.commit()
         print("Seed data created successfully!")
         print("\nLogin credentials:")
@@ -123,10 +129,8 @@ async def seed_data():
         print("\nEmployees:")
         for emp_data in employees_data:
             print(f"  {emp_data['email']} / {emp_data['password']} (PIN: {emp_data['pin']})")
-    
-    await engine.dispose()
 
 
 if __name__ == "__main__":
-    asyncio.run(seed_data())
+    run(seed_data)
 
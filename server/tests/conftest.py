@@ -1,14 +1,24 @@
 import os
 import pytest
 import asyncio
-from httpx import AsyncClient
+from contextlib import asynccontextmanager
+from httpx import ASGITransport, AsyncClient
 from sqlalchemy.engine.url import make_url
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from passlib.context import CryptContext
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
 from app.main import app
+from app.core import security
 from app.core.database import Base, get_db
 from app.core.config import settings
 
+# Tests exercise the hash/verify code paths, not Argon2's cost: minimum-cost Argon2 parameters
+# keep hashes real (and still verify hashes made with the default parameters). Swapped at import
+# time, not in a fixture, so module-level fixture hashes in the test files use it too.
+_TEST_ARGON2_PARAMS = {"argon2__time_cost": 1, "argon2__memory_cost": 8, "argon2__parallelism": 1}
+security.pwd_context = CryptContext(schemes=["argon2"], **_TEST_ARGON2_PARAMS)
+security.pin_context = CryptContext(schemes=["argon2"], **_TEST_ARGON2_PARAMS)
+
 
 def _async_test_database_url() -> str:
     """
@@ -39,8 +49,13 @@ TEST_DATABASE_URL = _async_test_database_url()
 
 @pytest.fixture(scope="session")
 def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
+    """Create an event loop for the test session (uvloop when installed)."""
+    try:
+        import uvloop
+        policy = uvloop.EventLoopPolicy()
+    except ImportError:
+        policy = asyncio.get_event_loop_policy()
+    loop = policy.new_event_loop()
     yield loop
     loop.close()
 
@@ -61,27 +76,67 @@ async def engine():
     await engine.dispose()
 
 
+@pytest.fixture(scope="session")
+async def connection(engine):
+    """
+    One connection and outer transaction for the whole test session, rolled back at the end.
+    Session-scoped fixtures commit into it so their rows are shared by every test.
+    """
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        yield conn
+        await trans.rollback()
+
+
+@asynccontextmanager
+async def _savepoint_session(connection):
+    """
+    AsyncSession on ``connection`` inside a SAVEPOINT that is rolled back on exit.
+
+    ``session.commit()`` (in tests or app code) only releases an inner savepoint, so rows
+    written through the session are visible until the context exits and never leak past it.
+    """
+    nested = await connection.begin_nested()
+    async with AsyncSession(
+        bind=connection,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    ) as session:
+        yield session
+    await nested.rollback()
+
+
+@pytest.fixture(scope="session")
+def savepoint_session(connection):
+    """Factory for savepoint-bound sessions, for fixtures with a wider scope than ``db``."""
+    return lambda: _savepoint_session(connection)
+
+
 @pytest.fixture
-async def db(engine):
-    """Create a test database session."""
-    async_session_maker = async_sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
-    )
-    async with async_session_maker() as session:
+async def db(connection):
+    """Create a test database session wrapped in a SAVEPOINT that is rolled back after the test."""
+    async with _savepoint_session(connection) as session:
         yield session
-        await session.rollback()
+
+
+@pytest.fixture(scope="session")
+async def shared_client():
+    """One AsyncClient (and connection pool) for the whole test session."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
 
 
 @pytest.fixture
-async def client(db: AsyncSession):
-    """Create a test client."""
+async def client(shared_client: AsyncClient, db: AsyncSession):
+    """Create a test client bound to this test's database session."""
     async def override_get_db():
         yield db
     
     app.dependency_overrides[get_db] = override_get_db
+    # Cookies (e.g. the refresh token) must not carry over between tests
+    shared_client.cookies.clear()
     
-    async with AsyncClient(app=app, base_url="http://test") as ac:
-        yield ac
+    yield shared_client
     
     app.dependency_overrides.clear()
 
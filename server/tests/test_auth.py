@@ -1,6 +1,5 @@
 import pytest
 from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.models.user import User, UserRole, UserStatus
@@ -8,6 +7,9 @@ from app.models.company import Company
 from app.core.security import get_password_hash
 import uuid
 
+# Hashed once per process; the fixture password is a fixed literal
+TEST_PASSWORD_HASH = get_password_hash("Test123!")
+
 
 @pytest.mark.asyncio
 async def test_register_company(client: AsyncClient):
@@ -79,30 +81,30 @@ async def test_login_invalid_credentials(client: AsyncClient):
     assert response.status_code == 401
 
 
-@pytest.fixture
-async def test_user(db: AsyncSession) -> User:
-    """Create a test user."""
-    company = Company(
-        id=uuid.uuid4(),
-        name="Test Company",
-        slug=f"auth-{uuid.uuid4().hex[:12]}",
-        settings_json={"email_verification_required": False},
-    )
-    db.add(company)
-    await db.flush()
-    
-    user = User(
-        id=uuid.uuid4(),
-        company_id=company.id,
-        role=UserRole.ADMIN,
-        name="Test User",
-        email="test@example.com",
-        password_hash=get_password_hash("Test123!"),
-        status=UserStatus.ACTIVE,
-        email_verified=True,
-    )
-    db.add(user)
-    await db.commit()
-    await db.refresh(user)
-    return user
-
+@pytest.fixture(scope="session")
+async def test_user(savepoint_session) -> User:
+    """Create a test user once per session (kept until the end of the test session)."""
+    async with savepoint_session() as db:
+        company = Company(
+            id=uuid.uuid4(),
+            name="Test Company",
+            slug=f"auth-{uuid.uuid4().hex[:12]}",
+            settings_json={"email_verification_required": False},
+        )
+        db.add(company)
+        await db.flush()
+        
+        user = User(
+            id=uuid.uuid4(),
+            company_id=company.id,
+            role=UserRole.ADMIN,
+            name="Test User",
+            email="test@example.com",
+            password_hash=TEST_PASSWORD_HASH,
+            status=UserStatus.ACTIVE,
+            email_verified=True,
+        )
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+        yield user
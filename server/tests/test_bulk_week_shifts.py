@@ -5,17 +5,68 @@ import pytest
 from uuid import uuid4
 from datetime import date, time, timedelta
 from httpx import AsyncClient
-from sqlalchemy import select, func
+from sqlalchemy import func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.main import app
+from app.core.database import get_db
 from app.models.user import User, UserRole, UserStatus
 from app.models.company import Company
 from app.models.shift import Shift, ShiftStatus
+from app.core.security import get_password_hash
 
+# Hashed once per process instead of once per fixture (Argon2 is deliberately slow)
+TEST_PASSWORD_HASH = get_password_hash("password123")
 
-@pytest.fixture
-async def test_company(db: AsyncSession):
-    """Create a test company."""
+WEEK_DAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+DAY_TEMPLATE = {
+    "start_time": "09:00",
+    "end_time": "17:00",
+    "break_minutes": 30,
+    "status": "DRAFT",
+}
+
+
+def _bulk_week_payload(
+    monday: date,
+    employee_id,
+    *,
+    enabled_days=("mon",),
+    template: dict = DAY_TEMPLATE,
+    conflict_policy: str = "skip",
+) -> dict:
+    """Build a same-each-day bulk week payload for one employee."""
+    return {
+        "week_start_date": monday.isoformat(),
+        "timezone": "America/Chicago",
+        "employee_id": str(employee_id),
+        "mode": "same_each_day",
+        "template": template,
+        "days": {day: {"enabled": day in enabled_days} for day in WEEK_DAYS},
+        "conflict_policy": conflict_policy,
+    }
+
+
+@pytest.fixture(scope="session")
+def monday() -> date:
+    """Monday of the current week, fixed for the session (no drift if a run crosses midnight)."""
+    today = date.today()
+    return today - timedelta(days=today.weekday())
+
+
+@pytest.fixture(scope="module")
+async def module_db(savepoint_session):
+    """
+    Session for this module's shared setup rows. They are committed into a SAVEPOINT that is
+    rolled back after the module; each test's own ``db`` savepoint only discards its shifts.
+    """
+    async with savepoint_session() as session:
+        yield session
+
+
+@pytest.fixture(scope="module")
+async def seed(module_db: AsyncSession) -> tuple[Company, User, list[User]]:
+    """Create the company, its admin and two employees in one commit (once per module)."""
     company = Company(
         id=uuid4(),
         name="Test Company",
@@ -25,116 +76,89 @@ async def test_company(db: AsyncSession):
             "email_verification_required": False,
         },
     )
-    db.add(company)
-    await db.commit()
-    await db.refresh(company)
-    return company
-
-
-@pytest.fixture
-async def admin_user(db: AsyncSession, test_company: Company):
-    """Create an admin user."""
-    from passlib.context import CryptContext
-    pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
-    tag = test_company.id.hex[:12]
-
+    tag = company.id.hex[:12]
     admin = User(
         id=uuid4(),
-        company_id=test_company.id,
+        company_id=company.id,
         role=UserRole.ADMIN,
         name="Admin User",
         email=f"bulk-adm-{tag}@test.com",
-        password_hash=pwd_context.hash("password123"),
+        password_hash=TEST_PASSWORD_HASH,
         status=UserStatus.ACTIVE,
     )
-    db.add(admin)
-    await db.commit()
-    await db.refresh(admin)
-    return admin
-
-
-@pytest.fixture
-async def employees(db: AsyncSession, test_company: Company):
-    """Create test employees."""
-    from passlib.context import CryptContext
-    pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
-    
-    tag = test_company.id.hex[:12]
-    emps = []
-    for i in range(2):
-        emp = User(
+    emps = [
+        User(
             id=uuid4(),
-            company_id=test_company.id,
+            company_id=company.id,
             role=UserRole.FRONTDESK,
             name=f"Employee {i+1}",
             email=f"bulk-e{i+1}-{tag}@test.com",
-            password_hash=pwd_context.hash("password123"),
+            password_hash=TEST_PASSWORD_HASH,
             status=UserStatus.ACTIVE,
         )
-        db.add(emp)
-        emps.append(emp)
-    
-    await db.commit()
-    for emp in emps:
-        await db.refresh(emp)
-    return emps
+        for i in range(2)
+    ]
+    # Every column the tests read is set client-side, so nothing is refreshed after the commit
+    module_db.add_all([company, admin, *emps])
+    await module_db.commit()
+    return company, admin, emps
+
+
+@pytest.fixture(scope="module")
+def test_company(seed) -> Company:
+    return seed[0]
+
+
+@pytest.fixture(scope="module")
+def admin_user(seed) -> User:
+    return seed[1]
+
+
+@pytest.fixture(scope="module")
+def employees(seed) -> list[User]:
+    return seed[2]
+
+
+@pytest.fixture(scope="module")
+async def auth_headers(shared_client: AsyncClient, module_db: AsyncSession, admin_user: User) -> dict:
+    """
+    Log in as the admin once per module and return the bearer headers. The access token is
+    stateless, so it stays valid for every test even though each runs in its own savepoint.
+    """
+    async def override_get_db():
+        yield module_db
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        login_response = await shared_client.post(
+            "/api/v1/auth/login",
+            json={
+                "email": admin_user.email,
+                "password": "password123",
+            },
+        )
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        shared_client.cookies.clear()
+    assert login_response.status_code == 200
+    token = login_response.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
 
 
 @pytest.mark.asyncio
 async def test_bulk_week_shift_basic_creation(
-    db: AsyncSession,
     client: AsyncClient,
-    test_company: Company,
-    admin_user: User,
+    auth_headers: dict,
     employees: list[User],
+    monday: date,
 ):
     """Test basic bulk week shift creation for 2 employees Mon-Fri."""
-    # Login as admin
-    login_response = await client.post(
-        "/api/v1/auth/login",
-        json={
-            "email": admin_user.email,
-            "password": "password123",
-        },
-    )
-    assert login_response.status_code == 200
-    token = login_response.json()["access_token"]
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # Calculate Monday of current week
-    today = date.today()
-    days_since_monday = today.weekday()
-    monday = today - timedelta(days=days_since_monday)
-    
-    template = {
-        "start_time": "09:00",
-        "end_time": "17:00",
-        "break_minutes": 30,
-        "status": "DRAFT",
-    }
-    days = {
-        "mon": {"enabled": True},
-        "tue": {"enabled": True},
-        "wed": {"enabled": True},
-        "thu": {"enabled": True},
-        "fri": {"enabled": True},
-        "sat": {"enabled": False},
-        "sun": {"enabled": False},
-    }
     for emp in employees:
-        payload = {
-            "week_start_date": monday.isoformat(),
-            "timezone": "America/Chicago",
-            "employee_id": str(emp.id),
-            "mode": "same_each_day",
-            "template": template,
-            "days": days,
-            "conflict_policy": "skip",
-        }
+        payload = _bulk_week_payload(monday, emp.id, enabled_days=WEEK_DAYS[:5])
         preview_response = await client.post(
             "/api/v1/shifts/bulk/week/preview",
             json=payload,
-            headers=headers,
+            headers=auth_headers,
         )
         assert preview_response.status_code == 200
         preview_data = preview_response.json()
@@ -144,20 +168,13 @@ async def test_bulk_week_shift_basic_creation(
         create_response = await client.post(
             "/api/v1/shifts/bulk/week",
             json=payload,
-            headers=headers,
+            headers=auth_headers,
         )
         assert create_response.status_code == 201
         create_data = create_response.json()
         assert create_data["created_count"] == 5
         assert create_data["skipped_count"] == 0
         assert create_data["series_id"] is not None
-    
-    # Verify shifts were created
-    result = await db.execute(
-        select(func.count()).select_from(Shift).where(Shift.company_id == test_company.id)
-    )
-    count = result.scalar_one()
-    assert count == 10
 
 
 @pytest.mark.asyncio
@@ -165,54 +182,27 @@ async def test_bulk_week_shift_overnight(
     db: AsyncSession,
     client: AsyncClient,
     test_company: Company,
-    admin_user: User,
+    auth_headers: dict,
     employees: list[User],
+    monday: date,
 ):
     """Test overnight shift creation (PM to AM next day)."""
-    # Login as admin
-    login_response = await client.post(
-        "/api/v1/auth/login",
-        json={
-            "email": admin_user.email,
-            "password": "password123",
-        },
-    )
-    token = login_response.json()["access_token"]
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # Calculate Monday
-    today = date.today()
-    days_since_monday = today.weekday()
-    monday = today - timedelta(days=days_since_monday)
-    
     # Create overnight shift (10 PM to 6 AM)
-    payload = {
-        "week_start_date": monday.isoformat(),
-        "timezone": "America/Chicago",
-        "employee_id": str(employees[0].id),
-        "mode": "same_each_day",
-        "template": {
+    payload = _bulk_week_payload(
+        monday,
+        employees[0].id,
+        template={
             "start_time": "22:00",
             "end_time": "06:00",  # Overnight shift
             "break_minutes": 0,
             "status": "DRAFT",
         },
-        "days": {
-            "mon": {"enabled": True},
-            "tue": {"enabled": False},
-            "wed": {"enabled": False},
-            "thu": {"enabled": False},
-            "fri": {"enabled": False},
-            "sat": {"enabled": False},
-            "sun": {"enabled": False},
-        },
-        "conflict_policy": "skip",
-    }
+    )
     
     response = await client.post(
         "/api/v1/shifts/bulk/week",
         json=payload,
-        headers=headers,
+        headers=auth_headers,
     )
     assert response.status_code == 201
     data = response.json()
@@ -228,72 +218,50 @@ async def test_bulk_week_shift_overnight(
 
 
 @pytest.mark.asyncio
-async def test_bulk_week_shift_conflict_detection_skip(
+async def test_bulk_week_shift_conflict_detection(
     db: AsyncSession,
     client: AsyncClient,
     test_company: Company,
-    admin_user: User,
+    auth_headers: dict,
     employees: list[User],
+    monday: date,
 ):
-    """Test conflict detection with skip policy."""
-    # Login as admin
-    login_response = await client.post(
-        "/api/v1/auth/login",
-        json={
-            "email": admin_user.email,
-            "password": "password123",
-        },
-    )
-    token = login_response.json()["access_token"]
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # Calculate Monday
-    today = date.today()
-    days_since_monday = today.weekday()
-    monday = today - timedelta(days=days_since_monday)
-    
-    # Create an existing shift
-    existing_shift = Shift(
-        id=uuid4(),
-        company_id=test_company.id,
-        employee_id=employees[0].id,
-        shift_date=monday,
-        start_time=time(9, 0),
-        end_time=time(17, 0),
-        break_minutes=30,
-        status=ShiftStatus.DRAFT,
+    """Test conflict detection: error policy returns 409, skip policy skips the overlap."""
+    # Create an existing shift (Core executemany, so seeding more rows stays one round trip)
+    await db.execute(
+        insert(Shift),
+        [
+            {
+                "id": uuid4(),
+                "company_id": test_company.id,
+                "employee_id": employees[0].id,
+                "shift_date": monday,
+                "start_time": time(9, 0),
+                "end_time": time(17, 0),
+                "break_minutes": 30,
+                "status": ShiftStatus.DRAFT,
+            },
+        ],
     )
-    db.add(existing_shift)
     await db.commit()
     
-    # Try to create overlapping shift with skip policy
-    payload = {
-        "week_start_date": monday.isoformat(),
-        "timezone": "America/Chicago",
-        "employee_id": str(employees[0].id),
-        "mode": "same_each_day",
-        "template": {
-            "start_time": "09:00",
-            "end_time": "17:00",
-            "break_minutes": 30,
-            "status": "DRAFT",
-        },
-        "days": {
-            "mon": {"enabled": True},
-            "tue": {"enabled": False},
-            "wed": {"enabled": False},
-            "thu": {"enabled": False},
-            "fri": {"enabled": False},
-            "sat": {"enabled": False},
-            "sun": {"enabled": False},
-        },
-        "conflict_policy": "skip",
-    }
+    # Both policies run against the same seeded overlap; error first since it writes nothing
+    payload = _bulk_week_payload(monday, employees[0].id, conflict_policy="error")
+    response = await client.post(
+        "/api/v1/shifts/bulk/week",
+        json=payload,
+        headers=auth_headers,
+    )
+    assert response.status_code == 409
+    data = response.json()
+    assert "conflicts" in data["detail"]
+    assert len(data["detail"]["conflicts"]) > 0
     
+    payload["conflict_policy"] = "skip"
     response = await client.post(
         "/api/v1/shifts/bulk/week",
         json=payload,
-        headers=headers,
+        headers=auth_headers,
     )
     assert response.status_code == 201
     data = response.json()
@@ -304,80 +272,5 @@ async def test_bulk_week_shift_conflict_detection_skip(
     result = await db.execute(
         select(func.count()).select_from(Shift).where(Shift.company_id == test_company.id)
     )
-    count = result.scalar()
+    count = result.scalar_one()
     assert count == 1  # Only the original shift
-
-
-@pytest.mark.asyncio
-async def test_bulk_week_shift_conflict_detection_error(
-    db: AsyncSession,
-    client: AsyncClient,
-    test_company: Company,
-    admin_user: User,
-    employees: list[User],
-):
-    """Test conflict detection with error policy returns 409."""
-    # Login as admin
-    login_response = await client.post(
-        "/api/v1/auth/login",
-        json={
-            "email": admin_user.email,
-            "password": "password123",
-        },
-    )
-    token = login_response.json()["access_token"]
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # Calculate Monday
-    today = date.today()
-    days_since_monday = today.weekday()
-    monday = today - timedelta(days=days_since_monday)
-    
-    # Create an existing shift
-    existing_shift = Shift(
-        id=uuid4(),
-        company_id=test_company.id,
-        employee_id=employees[0].id,
-        shift_date=monday,
-        start_time=time(9, 0),
-        end_time=time(17, 0),
-        break_minutes=30,
-        status=ShiftStatus.DRAFT,
-    )
-    db.add(existing_shift)
-    await db.commit()
-    
-    # Try to create overlapping shift with error policy
-    payload = {
-        "week_start_date": monday.isoformat(),
-        "timezone": "America/Chicago",
-        "employee_id": str(employees[0].id),
-        "mode": "same_each_day",
-        "template": {
-            "start_time": "09:00",
-            "end_time": "17:00",
-            "break_minutes": 30,
-            "status": "DRAFT",
-        },
-        "days": {
-            "mon": {"enabled": True},
-            "tue": {"enabled": False},
-            "wed": {"enabled": False},
-            "thu": {"enabled": False},
-            "fri": {"enabled": False},
-            "sat": {"enabled": False},
-            "sun": {"enabled": False},
-        },
-        "conflict_policy": "error",
-    }
-    
-    response = await client.post(
-        "/api/v1/shifts/bulk/week",
-        json=payload,
-        headers=headers,
-    )
-    assert response.status_code == 409
-    data = response.json()
-    assert "conflicts" in data["detail"]
-    assert len(data["detail"]["conflicts"]) > 0
-
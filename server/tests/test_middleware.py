@@ -0,0 +1,90 @@
+"""Behavioural tests for the pure ASGI middlewares (security headers, HTTPS redirect, rate limit, access log)."""
+import logging
+
+import pytest
+from httpx import AsyncClient
+
+from app.middleware import rate_limit as rl
+from app.middleware import security_headers as sh
+from app.middleware.access_log import AccessLogMiddleware
+
+
+@pytest.fixture
+def clear_rate_limit_windows():
+    rl._global_window.clear()
+    rl._strict_window.clear()
+    rl._schedule_window.clear()
+    yield
+    rl._global_window.clear()
+    rl._strict_window.clear()
+    rl._schedule_window.clear()
+
+
+@pytest.mark.asyncio
+async def test_security_headers_on_api_response(client: AsyncClient):
+    response = await client.get("/api/v1/health/live")
+    assert response.status_code == 200
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+    assert response.headers["X-Frame-Options"] == "DENY"
+    assert response.headers["Referrer-Policy"] == "strict-origin-when-cross-origin"
+    assert "geolocation=()" in response.headers["Permissions-Policy"]
+    assert "default-src 'none'" in response.headers["Content-Security-Policy"]
+    # HSTS only in production behind HTTPS
+    assert "Strict-Transport-Security" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_production_http_redirects_to_https(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(sh, "is_production_environment", lambda: True)
+    response = await client.get(
+        "/api/v1/health/live?probe=1",
+        headers={"X-Forwarded-Proto": "http"},
+    )
+    assert response.status_code == 301
+    assert response.headers["location"] == "https://test/api/v1/health/live?probe=1"
+
+
+@pytest.mark.asyncio
+async def test_production_https_adds_hsts(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(sh, "is_production_environment", lambda: True)
+    response = await client.get(
+        "/api/v1/health/live",
+        headers={"X-Forwarded-Proto": "https"},
+    )
+    assert response.status_code == 200
+    assert "max-age=31536000" in response.headers["Strict-Transport-Security"]
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_returns_429_when_exhausted(
+    client: AsyncClient, monkeypatch, clear_rate_limit_windows
+):
+    monkeypatch.setattr(rl.settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(rl.settings, "RATE_LIMIT_PER_MINUTE", 2)
+    monkeypatch.setattr(rl.settings, "REDIS_URL", None)
+    headers = {"X-Forwarded-For": "203.0.113.7"}
+    path = "/api/v1/rate-limit-probe"  # not exempt; 404 once it reaches the app
+
+    for _ in range(2):
+        response = await client.get(path, headers=headers)
+        assert response.status_code == 404
+
+    response = await client.get(path, headers=headers)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(int(rl.WINDOW_SECONDS))
+    assert response.json() == {"detail": "Too many requests. Please try again later."}
+
+
+@pytest.mark.asyncio
+async def test_access_log_logs_unhandled_exception_and_reraises(caplog):
+    async def failing_app(scope, receive, send):
+        raise RuntimeError("boom")
+
+    middleware = AccessLogMiddleware(failing_app)
+    scope = {"type": "http", "method": "GET", "path": "/boom", "client": ("1.2.3.4", 5000)}
+
+    with caplog.at_level(logging.ERROR, logger="app.middleware.access_log"):
+        with pytest.raises(RuntimeError, match="boom"):
+            await middleware(scope, None, None)
+
+    assert "Unhandled exception in GET /boom" in caplog.text
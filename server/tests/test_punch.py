@@ -9,9 +9,12 @@ from app.models.user import User, UserRole, UserStatus
 from app.models.company import Company
 from app.core.security import get_password_hash, get_pin_hash
 
-# Kiosk punch uses PIN only; password is never used in these tests (random per fixture).
+# Kiosk punch uses PIN only; password is never used in these tests (random per process).
 _TEST_PIN_OK = "1234"
 _TEST_PIN_BAD = "9999"
+# Hashed once per process instead of once per fixture (Argon2 is deliberately slow)
+_TEST_PASSWORD_HASH = get_password_hash(secrets.token_urlsafe(32))
+_TEST_PIN_HASH = get_pin_hash(_TEST_PIN_OK)
 
 
 @pytest.mark.asyncio
@@ -81,20 +84,17 @@ async def test_employee(db: AsyncSession) -> User:
         slug=f"punch-{uuid.uuid4().hex[:12]}",
         settings_json={"email_verification_required": False},
     )
-    db.add(company)
-    await db.flush()
-
     employee = User(
         id=uuid.uuid4(),
         company_id=company.id,
         role=UserRole.FRONTDESK,
         name="Test Employee",
         email=f"punch-{uuid.uuid4().hex[:12]}@test.com",
-        password_hash=get_password_hash(secrets.token_urlsafe(32)),
-        pin_hash=get_pin_hash(_TEST_PIN_OK),
+        password_hash=_TEST_PASSWORD_HASH,
+        pin_hash=_TEST_PIN_HASH,
         status=UserStatus.ACTIVE,
     )
-    db.add(employee)
+    # company.id is client-generated, so both rows go in one flush (the unit of work orders them)
+    db.add_all([company, employee])
     await db.commit()
-    await db.refresh(employee)
     return employee
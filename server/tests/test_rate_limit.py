@@ -102,3 +102,18 @@ def test_schedule_requests_do_not_consume_global_bucket(monkeypatch):
     assert rl.check_rate_limit(ip, other)[0]
     assert rl.check_rate_limit(ip, other)[0]
     assert not rl.check_rate_limit(ip, other)[0]
+
+
+def test_client_ip_from_scope_precedence():
+    from starlette.requests import Request
+
+    cases = [
+        ({"type": "http", "headers": [(b"x-forwarded-for", b"8.8.8.8, 10.0.0.1"), (b"x-real-ip", b"9.9.9.9")], "client": ("1.2.3.4", 5000)}, "8.8.8.8"),
+        ({"type": "http", "headers": [(b"x-forwarded-for", b" , 10.0.0.1")], "client": ("1.2.3.4", 5000)}, "unknown"),
+        ({"type": "http", "headers": [(b"x-real-ip", b" 9.9.9.9 ")], "client": ("1.2.3.4", 5000)}, "9.9.9.9"),
+        ({"type": "http", "headers": [], "client": ("1.2.3.4", 5000)}, "1.2.3.4"),
+        ({"type": "http", "headers": [], "client": None}, "unknown"),
+    ]
+    for scope, expected in cases:
+        assert rl._client_ip_from_scope(scope) == expected
+        assert rl.get_client_ip(Request(scope)) == expected
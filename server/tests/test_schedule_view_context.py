@@ -8,6 +8,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User, UserRole, UserStatus
 from app.models.company import Company
+from app.core.security import get_password_hash
+
+TEST_PASSWORD_HASH = get_password_hash("password123")
 
 
 @pytest.fixture
@@ -25,15 +28,11 @@ async def svc_company(db: AsyncSession):
     )
     db.add(company)
     await db.commit()
-    await db.refresh(company)
     return company
 
 
 @pytest.fixture
 async def svc_admin(db: AsyncSession, svc_company: Company):
-    from passlib.context import CryptContext
-
-    pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
     tag = svc_company.id.hex[:12]
     admin = User(
         id=uuid4(),
@@ -41,20 +40,16 @@ async def svc_admin(db: AsyncSession, svc_company: Company):
         role=UserRole.ADMIN,
         name="Admin",
         email=f"svc-adm-{tag}@test.com",
-        password_hash=pwd_context.hash("password123"),
+        password_hash=TEST_PASSWORD_HASH,
         status=UserStatus.ACTIVE,
     )
     db.add(admin)
     await db.commit()
-    await db.refresh(admin)
     return admin
 
 
 @pytest.fixture
 async def svc_employee(db: AsyncSession, svc_company: Company):
-    from passlib.context import CryptContext
-
-    pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
     tag = svc_company.id.hex[:12]
     u = User(
         id=uuid4(),
@@ -62,21 +57,17 @@ async def svc_employee(db: AsyncSession, svc_company: Company):
         role=UserRole.FRONTDESK,
         name="Desk",
         email=f"svc-emp-{tag}@test.com",
-        password_hash=pwd_context.hash("password123"),
+        password_hash=TEST_PASSWORD_HASH,
         status=UserStatus.ACTIVE,
     )
     db.add(u)
     await db.commit()
-    await db.refresh(u)
     return u
 
 
 @pytest.fixture
 async def svc_frontdesk(db: AsyncSession, svc_company: Company):
     """FRONTDESK has ``schedule`` but not ``user_management``."""
-    from passlib.context import CryptContext
-
-    pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
     tag = svc_company.id.hex[:12]
     u = User(
         id=uuid4(),
@@ -84,12 +75,11 @@ async def svc_frontdesk(db: AsyncSession, svc_company: Company):
         role=UserRole.FRONTDESK,
         name="Viewer",
         email=f"svc-fd-{tag}@test.com",
-        password_hash=pwd_context.hash("password123"),
+        password_hash=TEST_PASSWORD_HASH,
         status=UserStatus.ACTIVE,
     )
     db.add(u)
     await db.commit()
-    await db.refresh(u)
     return u
 
 